@@ -17,12 +17,125 @@ Example:
     >>> is_valid = validator.validate("document.xml")
 """
 
-from pathlib import Path
+import os
+import threading
+from collections import OrderedDict
 
 import lxml.etree as ET
-from acdh_tei_pyutils.tei import TeiReader
-from pyschematron import validate_document
-from pyschematron.utils import load_xml_document
+
+_parser_tls = threading.local()
+
+
+def _get_parser():
+    """Return the XML parser of the calling thread.
+
+    Validation only needs the raw tree: skip the ID hash table, never resolve
+    entities or touch the network, and allow very large TEI documents. One
+    parser is kept per thread, since lxml parsers cannot be used by several
+    threads at once, and reusing it lets libxml2 keep its dictionary of
+    interned tag and attribute names across files.
+    """
+    parser = getattr(_parser_tls, "parser", None)
+    if parser is None:
+        parser = ET.XMLParser(
+            collect_ids=False, resolve_entities=False, no_network=True, huge_tree=True
+        )
+        _parser_tls.parser = parser
+    return parser
+
+
+# Schematron query bindings the XSLT 1.0 ISO skeleton bundled with lxml can run;
+# schemas using any other binding (e.g. xslt2) are interpreted by pyschematron.
+_XSLT1_QUERY_BINDINGS = {None, "xslt", "xslt1", "exslt"}
+
+# XPath expressions evaluated against every SVRL report, compiled once.
+_SVRL_NS = {"svrl": "http://purl.oclc.org/dsdl/svrl"}
+_SVRL_TEXT_XPATH = ET.XPath(".//svrl:text", namespaces=_SVRL_NS)
+# Like pyschematron's is_valid(), count fired reports as errors as well as
+# failed asserts, so a schema gets the same verdict whatever its query binding.
+_SVRL_ERRORS_XPATH = ET.XPath(
+    "//svrl:failed-assert | //svrl:successful-report", namespaces=_SVRL_NS
+)
+
+
+class _SchemaCache:
+    """Process-wide cache of compiled schemas.
+
+    Schemas are keyed by their absolute path and invalidated when the file's
+    modification time changes, so every process (e.g. each worker of the CLI's
+    process pool) parses and compiles a given schema only once.
+    """
+
+    def __init__(self):
+        self._rng = {}
+        self._schematron = {}
+
+    @staticmethod
+    def _lookup(cache, key):
+        mtime = os.path.getmtime(key)
+        entry = cache.get(key)
+        if entry is not None and entry[0] == mtime:
+            return mtime, entry[1]
+        return mtime, None
+
+    def get_rng(self, path):
+        """Return the compiled RelaxNG schema for `path`.
+
+        Args:
+            path (str): Path to the RelaxNG schema file (.rng).
+
+        Returns:
+            ET.RelaxNG: The compiled schema.
+        """
+        key = os.path.abspath(path)
+        mtime, schema = self._lookup(self._rng, key)
+        if schema is None:
+            schema = ET.RelaxNG(ET.parse(path, _get_parser()))
+            self._rng[key] = (mtime, schema)
+        return schema
+
+    def get_schematron(self, path):
+        """Return the compiled Schematron schema for `path`.
+
+        Schemas with an XSLT 1.0 query binding are compiled once into a
+        validating XSLT by lxml's ISO Schematron implementation, which runs in
+        libxslt. Other schemas (e.g. queryBinding="xslt2") are built once into
+        a reusable pyschematron validator, which supports XPath 2.0+.
+
+        Args:
+            path (str): Path to the Schematron schema file (.sch).
+
+        Returns:
+            tuple: The isoschematron.Schematron or the pyschematron validator,
+                and whether it is the compiled XSLT.
+        """
+        key = os.path.abspath(path)
+        mtime, entry = self._lookup(self._schematron, key)
+        if entry is None:
+            sch_doc = ET.parse(path, _get_parser())
+            uses_xslt = sch_doc.getroot().get("queryBinding") in _XSLT1_QUERY_BINDINGS
+            if uses_xslt:
+                # Importing isoschematron compiles the bundled ISO skeleton
+                # stylesheets, so it is only done when a schema needs them.
+                from lxml import isoschematron
+
+                schema = isoschematron.Schematron(
+                    sch_doc,
+                    store_report=True,
+                    error_finder=_SVRL_ERRORS_XPATH,
+                )
+            else:
+                from pyschematron import DirectModeSchematronValidatorFactory
+
+                # Building resolves includes and abstract patterns and compiles
+                # the queries, so it is done once instead of for every file.
+                schema = DirectModeSchematronValidatorFactory(sch_doc).build()
+            entry = (schema, uses_xslt)
+            self._schematron[key] = (mtime, entry)
+        return entry
+
+
+_SCHEMA_CACHE = _SchemaCache()
 
 
 def hello() -> str:
@@ -47,6 +160,8 @@ class Validator:
         schematron_schema: The loaded Schematron schema object, or False if not provided.
         path_to_schematron (str|bool): Path to the Schematron schema file, or False if not provided.
         verbose (bool): Whether to print detailed validation messages.
+        skip_schematron_on_rng_error (bool): Whether validate() skips Schematron
+            once RelaxNG failed.
 
     Example:
         >>> # Validate against both RelaxNG and Schematron
@@ -61,7 +176,13 @@ class Validator:
         >>> is_valid = rng_validator.validate_against_rng("document.xml")
     """
 
-    def __init__(self, path_to_rng=None, path_to_schematron=None, verbose=True):
+    def __init__(
+        self,
+        path_to_rng=None,
+        path_to_schematron=None,
+        verbose=True,
+        skip_schematron_on_rng_error=True,
+    ):
         """Initialize the Validator with schema files.
 
         Args:
@@ -71,29 +192,211 @@ class Validator:
                 If None, Schematron validation will be skipped.
             verbose (bool, optional): Whether to print detailed validation messages
                 and errors. Defaults to True.
+            skip_schematron_on_rng_error (bool, optional): Whether validate()
+                should skip Schematron validation for files that already failed
+                RelaxNG validation.
+                Set to False to get the full diagnostics of both checks.
+                Defaults to True.
 
         Raises:
             FileNotFoundError: If the specified schema files don't exist.
             ET.XMLSyntaxError: If the schema files are not valid XML.
         """
         if path_to_rng:
-            rng_path = Path(path_to_rng)
-            with open(rng_path, "r") as rng_file:
-                rng_doc = ET.parse(rng_file)
-            relaxng_schema = ET.RelaxNG(rng_doc)
-            self.relaxng_schema = relaxng_schema
+            self.relaxng_schema = _SCHEMA_CACHE.get_rng(path_to_rng)
             self.path_to_rng = path_to_rng
         else:
+            self.relaxng_schema = False
             self.path_to_rng = False
         if path_to_schematron:
-            schematron_path = Path(path_to_schematron)
-            schematron_schema = load_xml_document(schematron_path)
-            self.schematron_schema = schematron_schema
+            self.schematron_schema, self._schematron_uses_xslt = (
+                _SCHEMA_CACHE.get_schematron(path_to_schematron)
+            )
             self.path_to_schematron = path_to_schematron
         else:
             self.schematron_schema = False
+            self._schematron_uses_xslt = False
             self.path_to_schematron = False
         self.verbose = verbose
+        self.skip_schematron_on_rng_error = skip_schematron_on_rng_error
+        self._owner_thread = threading.get_ident()
+        self._thread_local = threading.local()
+
+    def _thread_relaxng_schema(self):
+        """Return the RelaxNG schema to use in the calling thread.
+
+        lxml collects validation errors on the schema object, so other threads
+        get their own compiled copy of the schema to keep error logs apart. The
+        copy is compiled on first use and released with the thread.
+        """
+        if threading.get_ident() == self._owner_thread:
+            return self.relaxng_schema
+        schema = getattr(self._thread_local, "relaxng_schema", None)
+        if schema is None:
+            schema = ET.RelaxNG(ET.parse(self.path_to_rng, _get_parser()))
+            self._thread_local.relaxng_schema = schema
+        return schema
+
+    def _parse(self, path_to_xml_file: str):
+        """Parse an XML file, collecting parse errors instead of raising them.
+
+        Args:
+            path_to_xml_file (str): Path to the XML file to parse.
+
+        Returns:
+            tuple: The parsed lxml tree, or None if the file could not be parsed,
+                and the list of messages.
+        """
+        try:
+            # Hand libxml2 the path so it reads the file itself; file objects or
+            # buffers (e.g. an mmap) would go through an extra Python-level copy.
+            return ET.parse(path_to_xml_file, _get_parser()), []
+        except Exception as e:
+            if self.verbose:
+                return None, [f"failed to parse {path_to_xml_file} due to {e}"]
+            return None, []
+
+    def _validate_tree_against_rng(
+        self, doc, path_to_xml_file: str
+    ) -> tuple[bool, list[str]]:
+        """Validate an already parsed XML tree against the RelaxNG schema.
+
+        Args:
+            doc: The parsed lxml tree of the XML file.
+            path_to_xml_file (str): Path to the XML file, used in messages.
+
+        Returns:
+            tuple[bool, list[str]]: True if the tree is valid according to the
+                RelaxNG schema, False otherwise, and the validation messages.
+        """
+        if not self.relaxng_schema:
+            return False, ["No RNG file path provided"]
+        messages = []
+        relaxng_schema = self._thread_relaxng_schema()
+        relaxng_valid = relaxng_schema.validate(doc)
+        if self.verbose and not relaxng_valid:
+            messages.append(
+                f"{path_to_xml_file} is not valid according to {self.path_to_rng} schema"
+            )
+            for error in relaxng_schema.error_log:
+                messages.append(f"  - {error}")
+        return relaxng_valid, messages
+
+    def _validate_tree_against_schematron(
+        self, doc, path_to_xml_file: str
+    ) -> tuple[bool, list[str]]:
+        """Validate an already parsed XML tree against the Schematron schema.
+
+        Args:
+            doc: The parsed lxml tree of the XML file.
+            path_to_xml_file (str): Path to the XML file, used in messages.
+
+        Returns:
+            tuple[bool, list[str]]: True if the tree is valid according to the
+                Schematron schema, False otherwise, and the validation messages.
+        """
+        if not self.schematron_schema:
+            return False, ["No schematron file path provided"]
+        messages = []
+        if self._schematron_uses_xslt:
+            schematron_valid = self.schematron_schema.validate(doc)
+        else:
+            result = self.schematron_schema.validate_xml(doc)
+            schematron_valid = result.is_valid()
+        if self.verbose and not schematron_valid:
+            messages.append(
+                f"{path_to_xml_file} is not valid according to {self.path_to_schematron}"
+            )
+            if self._schematron_uses_xslt:
+                report = self.schematron_schema.validation_report
+            else:
+                report = result.get_svrl()
+            for x in _SVRL_TEXT_XPATH(report):
+                error = x.text
+                messages.append(f"  - {error}")
+        return schematron_valid, messages
+
+    def check(
+        self, path_to_xml_file: str, rng: bool = True, schematron: bool = True
+    ) -> tuple[bool, list[str]]:
+        """Validate an XML file and return the messages instead of printing them.
+
+        This is what the validate methods use internally; it is useful when the
+        output has to be handled by the caller, e.g. when validating in
+        parallel.
+
+        Args:
+            path_to_xml_file (str): Path to the XML file to validate.
+            rng (bool, optional): Whether to validate against the RelaxNG schema.
+                Defaults to True.
+            schematron (bool, optional): Whether to validate against the
+                Schematron schema. Defaults to True.
+
+        Returns:
+            tuple[bool, list[str]]: True if the XML file is valid according to the
+                selected schemas, False otherwise, and the validation messages.
+                Messages other than missing schemas are only collected if verbose
+                is True.
+
+        Example:
+            >>> valid, messages = validator.check("document.xml", schematron=False)
+        """
+        rng_valid, schematron_valid, messages = self.check_stages(
+            path_to_xml_file, rng=rng, schematron=schematron
+        )
+        return rng_valid is not False and schematron_valid is not False, messages
+
+    def check_stages(
+        self, path_to_xml_file: str, rng: bool = True, schematron: bool = True
+    ) -> tuple[bool | None, bool | None, list[str]]:
+        """Like check(), but return the result of each schema separately.
+
+        Args:
+            path_to_xml_file (str): Path to the XML file to validate.
+            rng (bool, optional): Whether to validate against the RelaxNG schema.
+                Defaults to True.
+            schematron (bool, optional): Whether to validate against the
+                Schematron schema. Defaults to True.
+
+        Returns:
+            tuple[bool | None, bool | None, list[str]]: The RelaxNG result, the
+                Schematron result and the validation messages. A result is None
+                if that schema was not checked, e.g. Schematron after a RelaxNG
+                error with skip_schematron_on_rng_error. Both selected results
+                are False if the file cannot be parsed.
+
+        Example:
+            >>> rng_valid, sch_valid, messages = validator.check_stages("document.xml")
+        """
+        rng_valid = schematron_valid = None
+        doc, messages = self._parse(path_to_xml_file)
+        if doc is None:
+            return (False if rng else None), (False if schematron else None), messages
+        if rng:
+            rng_valid, rng_messages = self._validate_tree_against_rng(
+                doc, path_to_xml_file
+            )
+            messages.extend(rng_messages)
+            if (
+                schematron
+                and self.skip_schematron_on_rng_error
+                and self.relaxng_schema
+                and not rng_valid
+            ):
+                return rng_valid, None, messages
+        if schematron:
+            schematron_valid, schematron_messages = (
+                self._validate_tree_against_schematron(doc, path_to_xml_file)
+            )
+            messages.extend(schematron_messages)
+        return rng_valid, schematron_valid, messages
+
+    def _print_check(self, path_to_xml_file: str, **kwargs) -> bool:
+        """Run check() and print its messages, returning only the result."""
+        valid, messages = self.check(path_to_xml_file, **kwargs)
+        for message in messages:
+            print(message)
+        return valid
 
     def validate_against_rng(self, path_to_xml_file: str) -> bool:
         """Validate an XML file against the RelaxNG schema.
@@ -109,25 +412,7 @@ class Validator:
         Note:
             If verbose is True, validation errors will be printed to stdout.
         """
-        if not self.relaxng_schema:
-            print("No RNG file path provided")
-            return False
-        try:
-            doc = TeiReader(path_to_xml_file).tree
-        except Exception as e:
-            if self.verbose:
-                print(f"failed to parse {path_to_xml_file} due to {e}")
-            return False
-        relaxng_valid = self.relaxng_schema.validate(doc)
-        if not relaxng_valid:
-            if self.verbose:
-                print(
-                    f"{path_to_xml_file} is not valid according to {self.path_to_rng} schema"
-                )
-            if self.verbose:
-                for error in self.relaxng_schema.error_log:
-                    print(f"  - {error}")
-        return relaxng_valid
+        return self._print_check(path_to_xml_file, schematron=False)
 
     def validate_against_schematron(self, path_to_xml_file: str) -> bool:
         """Validate an XML file against the Schematron schema.
@@ -145,28 +430,7 @@ class Validator:
             Schematron validation provides more detailed semantic validation rules
             compared to RelaxNG's structural validation.
         """
-        if not self.schematron_schema:
-            print("No schematron file path provided")
-            return False
-        try:
-            doc = TeiReader(path_to_xml_file).tree
-        except Exception as e:
-            if self.verbose:
-                print(f"failed to parse {path_to_xml_file} due to {e}")
-            return False
-        result = validate_document(doc, self.schematron_schema)
-        schematron_valid = result.is_valid()
-        if self.verbose and not schematron_valid:
-            print(
-                f"{path_to_xml_file} is not valid according to {self.path_to_schematron}"
-            )
-            report = result.get_svrl()
-            for x in report.xpath(
-                ".//svrl:text", namespaces={"svrl": "http://purl.oclc.org/dsdl/svrl"}
-            ):
-                error = x.text
-                print(f"  - {error}")
-        return schematron_valid
+        return self._print_check(path_to_xml_file, rng=False)
 
     def validate(self, path_to_xml_file: str) -> bool:
         """Validate an XML file against both RelaxNG and Schematron schemas.
@@ -184,13 +448,65 @@ class Validator:
                 this will always return False.
 
         Note:
-            This method calls both validate_against_rng() and validate_against_schematron().
+            The XML file is parsed once and the tree is shared by the RelaxNG and
+            Schematron checks.
+            If skip_schematron_on_rng_error is True, Schematron validation is
+            skipped for files that already failed RelaxNG validation.
             If verbose is True, detailed validation messages will be printed for both
             validation steps.
         """
-        rng_valid = self.validate_against_rng(path_to_xml_file)
-        schematron_valid = self.validate_against_schematron(path_to_xml_file)
-        if rng_valid and schematron_valid:
-            return True
-        else:
-            return False
+        return self._print_check(path_to_xml_file)
+
+
+_VALIDATORS = OrderedDict()
+_VALIDATORS_MAXSIZE = 8
+
+
+def _getmtime(path):
+    return os.path.getmtime(path) if path else None
+
+
+def get_validator(
+    path_to_rng=None,
+    path_to_schematron=None,
+    verbose=True,
+    skip_schematron_on_rng_error=True,
+):
+    """Return a cached Validator for a schema combination.
+
+    Up to eight validators are kept, least recently used first out. A cached
+    validator is rebuilt when the modification time of one of its schema files
+    changed.
+
+    Args:
+        path_to_rng (str, optional): Path to the RelaxNG schema file (.rng).
+        path_to_schematron (str, optional): Path to the Schematron schema file (.sch).
+        verbose (bool, optional): Whether to print detailed validation messages
+            and errors. Defaults to True.
+        skip_schematron_on_rng_error (bool, optional): Whether validate() should
+            skip Schematron validation for files that already failed RelaxNG
+            validation.
+            Defaults to True.
+
+    Returns:
+        Validator: A validator for the given schemas.
+
+    Example:
+        >>> validator = get_validator(path_to_rng="schema.rng")
+        >>> validator is get_validator(path_to_rng="schema.rng")
+        True
+    """
+    key = (path_to_rng, path_to_schematron, verbose, skip_schematron_on_rng_error)
+    mtimes = (_getmtime(path_to_rng), _getmtime(path_to_schematron))
+    entry = _VALIDATORS.get(key)
+    if entry is not None and entry[0] == mtimes:
+        _VALIDATORS.move_to_end(key)
+        return entry[1]
+    validator = Validator(
+        path_to_rng, path_to_schematron, verbose, skip_schematron_on_rng_error
+    )
+    _VALIDATORS[key] = (mtimes, validator)
+    _VALIDATORS.move_to_end(key)
+    while len(_VALIDATORS) > _VALIDATORS_MAXSIZE:
+        _VALIDATORS.popitem(last=False)
+    return validator
@@ -0,0 +1,215 @@
+"""Persistent cache of validation results.
+
+The CLI stores the result of every validated file in a SQLite database and
+skips files whose modification time, size and schemas did not change since the
+last run, which makes repeated runs (e.g. in CI) cheap for unchanged files.
+
+Only the schema files given on the command line are fingerprinted: after
+changing a module pulled in through an RNG ``<include>``/``<externalRef>`` or a
+``<sch:include>``, clear the cache or run with ``--cache ""``.
+"""
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import sqlite3
+
+# Bumped whenever the layout of the results table changes; older tables are
+# dropped instead of migrated, as they only hold cached results.
+_SCHEMA_VERSION = 2
+
+
+def _version(distribution):
+    """Return the installed version of a distribution, or "" if it is missing."""
+    try:
+        return importlib.metadata.version(distribution)
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
+
+def _tool_versions():
+    """Return the versions of the packages that decide whether a file is valid.
+
+    They are part of every schema key, so results cached by an older release of
+    this package, lxml or pyschematron are not served after an upgrade.
+    """
+    return " ".join(
+        f"{name}={_version(name)}"
+        for name in ("acdh-xml-validator", "lxml", "pyschematron")
+    ).encode()
+
+
+def _schema_key(path, tool_versions=b""):
+    """Return the cache key component of a schema file, or b"" if not given.
+
+    The key is an 8 byte BLAKE2b digest of the tool versions and the schema's
+    content, so it stays valid when schemas are copied or touched without being
+    changed.
+    """
+    if not path:
+        return b""
+    digest = hashlib.blake2b(tool_versions, digest_size=8)
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    return digest.digest()
+
+
+class ResultCache:
+    """SQLite-backed cache of validation results.
+
+    Results are keyed by the absolute path, modification time and size of the
+    XML file, by the content of the schemas it was validated against and by the
+    installed versions of this package, lxml and pyschematron. The schemas are
+    hashed once when the cache is opened; schema modules they include are not.
+
+    Attributes:
+        rng_key (bytes): Fingerprint of the RelaxNG schema.
+        sch_key (bytes): Fingerprint of the Schematron schema.
+
+    Example:
+        >>> with ResultCache(".xml-validator-cache.sqlite", "schema.rng") as cache:
+        ...     if cache.get("document.xml") is None:
+        ...         cache.put("document.xml", True, [])
+    """
+
+    def __init__(
+        self,
+        path,
+        path_to_rng=None,
+        path_to_schematron=None,
+        skip_schematron_on_rng_error=True,
+        commit_every=100,
+    ):
+        """Open (and create if needed) the cache database.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            path_to_rng (str, optional): Path to the RelaxNG schema file (.rng).
+            path_to_schematron (str, optional): Path to the Schematron schema file (.sch).
+            skip_schematron_on_rng_error (bool, optional): Whether Schematron
+                validation is skipped for files that failed RelaxNG validation.
+                Results of runs that validate such files against both schemas
+                have more messages and are kept apart. Defaults to True.
+            commit_every (int, optional): Number of stored results after which
+                they are committed. Defaults to 100.
+
+        Raises:
+            OSError: If a schema file cannot be read; the database is not
+                touched in that case.
+            sqlite3.Error: If the database cannot be opened or created, e.g.
+                because its directory is not writable.
+        """
+        tool_versions = _tool_versions()
+        self.rng_key = _schema_key(path_to_rng, tool_versions)
+        self.sch_key = _schema_key(path_to_schematron, tool_versions)
+        if path_to_rng and path_to_schematron and not skip_schematron_on_rng_error:
+            self.sch_key += b"+all"
+        self.commit_every = commit_every
+        self._file_keys = {}
+        self._pending = 0
+        self.connection = sqlite3.connect(path)
+        try:
+            self._create_table()
+        except sqlite3.Error:
+            self.connection.close()
+            raise
+
+    def _create_table(self):
+        self.connection.execute("PRAGMA synchronous=OFF")
+        self.connection.execute("PRAGMA journal_mode=MEMORY")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            self.connection.execute("DROP TABLE IF EXISTS results")
+        # Also fails early if the database exists but is not writable.
+        self.connection.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "path TEXT, mtime REAL, size INTEGER, "
+            "rng_key BLOB, sch_key BLOB, valid INTEGER, messages TEXT, "
+            "rng_valid INTEGER, sch_valid INTEGER, "
+            "PRIMARY KEY (path, rng_key, sch_key))"
+        )
+
+    def get(self, path_to_xml_file):
+        """Return the cached result of an XML file.
+
+        Args:
+            path_to_xml_file (str): Path to the XML file.
+
+        Returns:
+            tuple[bool, list[str], bool | None, bool | None] | None: The cached
+                validation result, messages and RelaxNG and Schematron results,
+                or None if the file is not cached, has changed or cannot be
+                accessed.
+        """
+        try:
+            stat = os.stat(path_to_xml_file)
+        except OSError:
+            return None
+        key = (os.path.abspath(path_to_xml_file), stat.st_mtime, stat.st_size)
+        row = self.connection.execute(
+            "SELECT valid, messages, rng_valid, sch_valid FROM results WHERE path=? AND mtime=? AND size=? "
+            "AND rng_key=? AND sch_key=?",
+            (*key, self.rng_key, self.sch_key),
+        ).fetchone()
+        if row is None:
+            self._file_keys[path_to_xml_file] = key
+            return None
+        valid, messages, rng_valid, sch_valid = row
+        return (
+            bool(valid),
+            json.loads(messages),
+            None if rng_valid is None else bool(rng_valid),
+            None if sch_valid is None else bool(sch_valid),
+        )
+
+    def put(self, path_to_xml_file, valid, messages, rng_valid=None, sch_valid=None):
+        """Store the result of an XML file.
+
+        The file's modification time and size recorded by the preceding get()
+        call are used, so changes made during validation invalidate the entry.
+        Files that cannot be accessed are not stored.
+
+        Args:
+            path_to_xml_file (str): Path to the XML file.
+            valid (bool): The validation result.
+            messages (list[str]): The validation messages.
+            rng_valid (bool, optional): The RelaxNG result, None if not checked.
+            sch_valid (bool, optional): The Schematron result, None if not
+                checked.
+        """
+        key = self._file_keys.pop(path_to_xml_file, None)
+        if key is None:
+            try:
+                stat = os.stat(path_to_xml_file)
+            except OSError:
+                return
+            key = (os.path.abspath(path_to_xml_file), stat.st_mtime, stat.st_size)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                *key,
+                self.rng_key,
+                self.sch_key,
+                int(valid),
+                json.dumps(messages),
+                rng_valid,
+                sch_valid,
+            ),
+        )
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.connection.commit()
+            self._pending = 0
+
+    def close(self):
+        """Commit pending results and close the database."""
+        self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
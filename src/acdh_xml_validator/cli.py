@@ -8,16 +8,420 @@ Schematron schemas. Three commands are available:
 - validate-schematron: Validate against Schematron schema only
 
 All commands support glob patterns for batch validation and provide progress bars
-for multiple files.
+for multiple files. Files are validated in parallel, one worker process per CPU.
+Results can be written as newline-delimited JSON for downstream tools.
 """
 
 import glob
+import json
+import os
+import sqlite3
 import sys
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import closing, nullcontext
+from functools import partial
 
 import click
+import lxml.etree as ET
 from tqdm import tqdm
 
-from . import Validator
+from . import get_validator
+from .cache import ResultCache
+
+
+def _validate_one(
+    path_to_xml_file: str,
+    rng: str | None,
+    schematron: str | None,
+    skip_schematron_on_rng_error: bool = True,
+) -> tuple[str, bool, list[str], bool | None, bool | None]:
+    """Validate a single XML file inside a worker process.
+
+    The file is validated against every schema that is given. Schema paths are
+    passed instead of parsed schemas so nothing needs to be pickled. Messages
+    are returned instead of printed so the driver can write them without
+    interleaving output of different workers.
+
+    Args:
+        path_to_xml_file (str): Path to the XML file to validate.
+        rng (str, optional): Path to the RNG file.
+        schematron (str, optional): Path to the Schematron file.
+        skip_schematron_on_rng_error (bool, optional): Whether to skip
+            Schematron validation of files that failed RelaxNG validation.
+            Defaults to True.
+
+    Returns:
+        tuple[str, bool, list[str], bool | None, bool | None]: The path to the
+            XML file, the validation result, the validation messages and the
+            RelaxNG and Schematron results (None if not checked).
+    """
+    validator = get_validator(
+        path_to_rng=rng,
+        path_to_schematron=schematron,
+        skip_schematron_on_rng_error=skip_schematron_on_rng_error,
+    )
+    rng_valid, sch_valid, messages = validator.check_stages(
+        path_to_xml_file, rng=rng is not None, schematron=schematron is not None
+    )
+    valid = rng_valid is not False and sch_valid is not False
+    return path_to_xml_file, valid, messages, rng_valid, sch_valid
+
+
+def _load_validator(**kwargs):
+    """Build the validator in the driver, before any worker is started.
+
+    This fails early with a click error if a schema is missing or invalid, and
+    workers started with fork inherit the compiled schemas instead of each
+    compiling them again.
+
+    Args:
+        **kwargs: Passed on to get_validator().
+
+    Returns:
+        Validator: The cached validator.
+
+    Raises:
+        click.ClickException: If a schema cannot be read or compiled.
+    """
+    try:
+        return get_validator(**kwargs)
+    except (OSError, ET.LxmlError) as e:
+        raise click.ClickException(f"Cannot load schema: {e}")
+
+
+def _imap_bounded(executor, fn, files, window, cache=None):
+    """Validate files in an executor with a bounded number of pending tasks.
+
+    Files are taken from `files` only while fewer than `window` tasks are
+    pending, so validation starts right away, results are reported while a
+    large glob is still being expanded and the driver never holds more than
+    `window` futures.
+
+    Args:
+        executor (Executor): The executor to submit to.
+        fn (Callable): Called with a path; returns a result tuple as
+            _validate_one() does.
+        files (Iterable[str]): Paths to the XML files to validate.
+        window (int): Maximum number of pending tasks.
+        cache (ResultCache, optional): Result cache; cached files are yielded
+            as soon as they are found and fresh results are stored.
+
+    Yields:
+        tuple[str, bool, list[str], bool | None, bool | None]: The result of
+            each file as returned by _validate_one(), in completion order.
+    """
+    files = iter(files)
+    pending = set()
+    while True:
+        for x in files:
+            hit = cache.get(x) if cache is not None else None
+            if hit is not None:
+                yield (x, *hit)
+                continue
+            pending.add(executor.submit(fn, x))
+            if len(pending) >= window:
+                break
+        if not pending:
+            return
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            result = future.result()
+            if cache is not None:
+                cache.put(*result)
+            yield result
+
+
+def _validate_in_pool(
+    files, rng=None, schematron=None, skip_schematron_on_rng_error=True, cache=None
+):
+    """Validate files in a process pool and yield their results.
+
+    The schemas are compiled once in the driver before the pool is started, see
+    _load_validator().
+
+    Args:
+        files (Iterable[str]): Paths to the XML files to validate.
+        rng (str, optional): Path to the RNG file.
+        schematron (str, optional): Path to the Schematron file.
+        skip_schematron_on_rng_error (bool, optional): Whether to skip
+            Schematron validation of files that failed RelaxNG validation.
+            Defaults to True.
+        cache (ResultCache, optional): Result cache of unchanged files.
+
+    Yields:
+        tuple[str, bool, list[str], bool | None, bool | None]: The result of
+            each file as returned by _validate_one(), in completion order.
+            Files not yet started are cancelled when the consumer stops
+            iterating early.
+
+    Raises:
+        click.ClickException: If a schema cannot be read or compiled.
+    """
+    _load_validator(
+        path_to_rng=rng,
+        path_to_schematron=schematron,
+        skip_schematron_on_rng_error=skip_schematron_on_rng_error,
+    )
+    workers = os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+    fn = partial(
+        _validate_one,
+        rng=rng,
+        schematron=schematron,
+        skip_schematron_on_rng_error=skip_schematron_on_rng_error,
+    )
+    try:
+        yield from tqdm(_imap_bounded(executor, fn, files, 4 * workers, cache))
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _validate_rng_in_threads(files, threads, rng, cache=None):
+    """Validate files against a RelaxNG schema in a thread pool.
+
+    libxml2 releases the GIL while validating, so threads sharing one
+    Validator avoid the process start-up and pickling costs of the process
+    pool for RelaxNG-only validation.
+
+    Args:
+        files (Iterable[str]): Paths to the XML files to validate.
+        threads (int): Number of worker threads.
+        rng (str): Path to the RNG file.
+        cache (ResultCache, optional): Result cache of unchanged files.
+
+    Yields:
+        tuple[str, bool, list[str], bool | None, bool | None]: The result of
+            each file as returned by _validate_one(), in completion order.
+    """
+    validator = _load_validator(path_to_rng=rng)
+
+    def validate_one(path_to_xml_file):
+        valid, messages = validator.check(path_to_xml_file, schematron=False)
+        return path_to_xml_file, valid, messages, valid, None
+
+    executor = ThreadPoolExecutor(max_workers=threads)
+    try:
+        yield from tqdm(
+            _imap_bounded(executor, validate_one, files, 4 * threads, cache)
+        )
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _with_cache(
+    files,
+    cache_path,
+    validate_files,
+    rng=None,
+    schematron=None,
+    skip_schematron_on_rng_error=True,
+):
+    """Open the result cache and validate the files with it.
+
+    If the cache cannot be opened, e.g. because the directory is not writable,
+    a warning is shown and all files are validated.
+
+    Args:
+        files (Iterable[str]): Paths to the XML files to validate.
+        cache_path (str): Path to the SQLite result cache, or an empty string
+            to disable caching.
+        validate_files (Callable): Called with the files and the opened cache
+            (or None) as `cache` keyword; must yield result tuples as
+            _validate_one() returns them.
+        rng (str, optional): Path to the RNG file.
+        schematron (str, optional): Path to the Schematron file.
+        skip_schematron_on_rng_error (bool, optional): Whether Schematron
+            validation is skipped for files that failed RelaxNG validation.
+            Defaults to True.
+
+    Yields:
+        tuple[str, bool, list[str], bool | None, bool | None]: The result of
+            each file as returned by _validate_one().
+
+    Raises:
+        click.ClickException: If a schema file cannot be read.
+    """
+    cache = None
+    if cache_path:
+        try:
+            cache = ResultCache(
+                cache_path, rng, schematron, skip_schematron_on_rng_error
+            )
+        except OSError as e:
+            raise click.ClickException(f"Cannot read schema: {e}")
+        except sqlite3.Error as e:
+            click.echo(
+                click.style(f"Result cache disabled: {cache_path}: {e}", fg="yellow"),
+                err=True,
+            )
+    with cache or nullcontext():
+        yield from validate_files(files, cache=cache)
+
+
+class _Reporter:
+    """Report validation results as text or as newline-delimited JSON.
+
+    In json format every file is written as one record
+    ``{"path": ..., "valid": ..., "rng_valid": ..., "sch_valid": ...,
+    "errors": [...]}``, flushed immediately, and a final
+    ``{"summary": {...}}`` record is written at the end. ``rng_valid`` and
+    ``sch_valid`` are null for schemas the file was not checked against.
+
+    Attributes:
+        all_ok (bool): Whether all reported files are valid.
+        failed (list[str]): Paths of the files that failed validation.
+        done (set[str]): Paths already recorded in the out file of a resumed run.
+    """
+
+    def __init__(self, output_format="text", out_file=None, resume=False):
+        """Open the output for the selected format.
+
+        Args:
+            output_format (str, optional): Either "text" or "json".
+                Defaults to "text".
+            out_file (str, optional): File to write json records to. Defaults
+                to stdout.
+            resume (bool, optional): Whether to keep the records already in
+                `out_file` and skip their files. Defaults to False.
+
+        Raises:
+            click.UsageError: If an out file is given for text output or resume
+                is requested without a json out file.
+        """
+        self.output_format = output_format
+        self.all_ok = True
+        self.failed = []
+        self.done = set()
+        if out_file and output_format != "json":
+            raise click.UsageError("--out-file requires --format json.")
+        if resume and not out_file:
+            raise click.UsageError("--resume requires --format json and --out-file.")
+        if out_file:
+            if resume:
+                self._resume(out_file)
+            self.stream = open(
+                out_file, "a" if resume else "w", encoding="utf-8", buffering=1
+            )
+            self._close_stream = True
+        else:
+            self.stream = click.get_text_stream("stdout")
+            self._close_stream = False
+
+    def _resume(self, out_file):
+        """Load the file records of a previous run and rewrite the out file.
+
+        The summary of the previous run, a record cut off by an interrupted
+        run and lines that are not file records are dropped, so the resumed
+        out file ends with a single summary.
+        """
+        if not os.path.exists(out_file):
+            return
+        records = []
+        with open(out_file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and "path" in record and "valid" in record:
+                    records.append(record)
+                    self.done.add(record["path"])
+                    self._count(record["path"], record["valid"])
+        tmp_file = out_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.writelines(self._dumps(record) for record in records)
+        os.replace(tmp_file, out_file)
+
+    def _count(self, path_to_xml_file, valid):
+        self.all_ok &= valid
+        if not valid:
+            self.failed.append(path_to_xml_file)
+
+    def pending(self, files):
+        """Yield the files not yet recorded in a resumed out file."""
+        for x in files:
+            if x not in self.done:
+                yield x
+
+    @staticmethod
+    def _dumps(record):
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    def _write_record(self, record):
+        self.stream.write(self._dumps(record))
+        self.stream.flush()
+
+    def add(self, path_to_xml_file, valid, messages, rng_valid=None, sch_valid=None):
+        """Report the result of one file.
+
+        Args:
+            path_to_xml_file (str): Path to the XML file.
+            valid (bool): The validation result.
+            messages (list[str]): The validation messages.
+            rng_valid (bool, optional): The RelaxNG result, None if not checked.
+            sch_valid (bool, optional): The Schematron result, None if not
+                checked.
+        """
+        self._count(path_to_xml_file, valid)
+        if self.output_format == "json":
+            self._write_record(
+                {
+                    "path": path_to_xml_file,
+                    "valid": valid,
+                    "rng_valid": rng_valid,
+                    "sch_valid": sch_valid,
+                    "errors": messages,
+                }
+            )
+        elif messages:
+            tqdm.write("\n".join(messages))
+
+    def finish(self) -> None:
+        """Report the summary and exit with the matching exit code."""
+        if self.output_format == "json":
+            self._write_record(
+                {
+                    "summary": {
+                        "valid": self.all_ok,
+                        "failed": sorted(self.failed),
+                    }
+                }
+            )
+            if self._close_stream:
+                self.stream.close()
+        elif not self.all_ok:
+            for x in sorted(self.failed):
+                click.echo(f"  - {x}")
+            click.echo(click.style("ERRORS!!!!", fg="red"))
+        else:
+            click.echo(click.style("All good!", fg="green"))
+        sys.exit(0 if self.all_ok else 1)
+
+
+def _report(reporter, results, fail_fast):
+    """Report all results, then the summary, and exit.
+
+    The results are closed before the summary is reported, so the worker pool
+    is shut down and the result cache committed even when --fail-fast stops
+    early.
+
+    Args:
+        reporter (_Reporter): The reporter to report to.
+        results (Generator): The results as yielded by _with_cache().
+        fail_fast (bool): Whether to stop at the first file that fails
+            validation.
+    """
+    with closing(results):
+        for x, ok, messages, rng_valid, sch_valid in results:
+            reporter.add(x, ok, messages, rng_valid, sch_valid)
+            if fail_fast and not ok:
+                break
+    reporter.finish()
 
 
 @click.group()
@@ -54,31 +458,92 @@ def cli():
     help="Path to the Schematron file.",
     type=str,
 )
-def validate_all(files: str, rng: str, schematron: str) -> None:
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    default=False,
+    help="Stop at the first file that fails validation.",
+)
+@click.option(
+    "--skip-schematron-on-rng-error/--no-skip-schematron-on-rng-error",
+    default=True,
+    help="Skip Schematron validation of files that failed RelaxNG validation.",
+)
+@click.option(
+    "--cache",
+    default=".xml-validator-cache.sqlite",
+    help="Path to the result cache of unchanged files; pass an empty string to disable it.",
+    type=str,
+)
+@click.option(
+    "--format",
+    "output_format",
+    default="text",
+    help="Output format; json writes one JSON record per file.",
+    type=click.Choice(["text", "json"]),
+)
+@click.option(
+    "--out-file",
+    default=None,
+    help="File to write the json records to instead of stdout; requires --format json.",
+    type=str,
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Skip files already recorded in --out-file and append to it.",
+)
+def validate_all(
+    files: str,
+    rng: str,
+    schematron: str,
+    fail_fast: bool,
+    skip_schematron_on_rng_error: bool,
+    cache: str,
+    output_format: str,
+    out_file: str | None,
+    resume: bool,
+) -> None:
     """Validate XML files against both RelaxNG and Schematron schemas.
 
     This command validates XML files against both RelaxNG (.rng) and Schematron (.sch)
     schemas. Files must pass both validation checks to be considered valid.
 
     Args:
-        files: Glob pattern for XML files to validate (e.g., "data/*.xml")
+        files: Glob pattern for XML files to validate (e.g., "data/*.xml";
+            "**" matches nested directories)
         rng: Path to the RelaxNG schema file (.rng)
         schematron: Path to the Schematron schema file (.sch)
+        fail_fast: Stop at the first file that fails validation
+        skip_schematron_on_rng_error: Skip Schematron validation of files that
+            failed RelaxNG validation; disable to get the errors of both checks
+        cache: Path to the SQLite result cache; files that did not change since
+            they were last validated against the same schemas are skipped
+        output_format: "text" or "json" (one JSON record per file)
+        out_file: File to write the json records to instead of stdout
+        resume: Skip files already recorded in out_file and append to it
 
     Exit codes:
         0: All files are valid
         1: One or more files failed validation
     """
-    files = sorted(glob.glob(files))
-    validator = Validator(path_to_rng=rng, path_to_schematron=schematron)
-    results = set()
-    for x in tqdm(files):
-        results.add(validator.validate(x))
-    if False in results:
-        click.echo(click.style("ERRORS!!!!", fg="red"))
-        sys.exit(1)
-    else:
-        click.echo(click.style("All good!", fg="green"))
+    reporter = _Reporter(output_format, out_file, resume)
+    files = reporter.pending(glob.iglob(files, recursive=True))
+    results = _with_cache(
+        files,
+        cache,
+        partial(
+            _validate_in_pool,
+            rng=rng,
+            schematron=schematron,
+            skip_schematron_on_rng_error=skip_schematron_on_rng_error,
+        ),
+        rng=rng,
+        schematron=schematron,
+        skip_schematron_on_rng_error=skip_schematron_on_rng_error,
+    )
+    _report(reporter, results, fail_fast)
 
 
 @click.command()
@@ -96,30 +561,83 @@ def validate_all(files: str, rng: str, schematron: str) -> None:
     help="Path to the RNG file.",
     type=str,
 )
-def validate_rng(files: str, rng: str) -> None:
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    default=False,
+    help="Stop at the first file that fails validation.",
+)
+@click.option(
+    "--threads",
+    default=0,
+    help="Validate in this many threads instead of one process per CPU.",
+    type=int,
+)
+@click.option(
+    "--cache",
+    default=".xml-validator-cache.sqlite",
+    help="Path to the result cache of unchanged files; pass an empty string to disable it.",
+    type=str,
+)
+@click.option(
+    "--format",
+    "output_format",
+    default="text",
+    help="Output format; json writes one JSON record per file.",
+    type=click.Choice(["text", "json"]),
+)
+@click.option(
+    "--out-file",
+    default=None,
+    help="File to write the json records to instead of stdout; requires --format json.",
+    type=str,
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Skip files already recorded in --out-file and append to it.",
+)
+def validate_rng(
+    files: str,
+    rng: str,
+    fail_fast: bool,
+    threads: int,
+    cache: str,
+    output_format: str,
+    out_file: str | None,
+    resume: bool,
+) -> None:
     """Validate XML files against RelaxNG schema only.
 
     This command validates XML files against a RelaxNG (.rng) schema for
     structural validation. Schematron validation is skipped.
 
     Args:
-        files: Glob pattern for XML files to validate (e.g., "data/*.xml")
+        files: Glob pattern for XML files to validate (e.g., "data/*.xml";
+            "**" matches nested directories)
         rng: Path to the RelaxNG schema file (.rng)
+        fail_fast: Stop at the first file that fails validation
+        threads: If greater than 0, validate in this many threads sharing one
+            validator instead of one process per CPU
+        cache: Path to the SQLite result cache; files that did not change since
+            they were last validated against the same schemas are skipped
+        output_format: "text" or "json" (one JSON record per file)
+        out_file: File to write the json records to instead of stdout
+        resume: Skip files already recorded in out_file and append to it
 
     Exit codes:
         0: All files are valid according to RelaxNG schema
         1: One or more files failed RelaxNG validation
     """
-    files = sorted(glob.glob(files))
-    validator = Validator(path_to_rng=rng)
-    results = set()
-    for x in tqdm(files):
-        results.add(validator.validate_against_rng(x))
-    if False in results:
-        click.echo(click.style("ERRORS!!!!", fg="red"))
-        sys.exit(1)
+    reporter = _Reporter(output_format, out_file, resume)
+    files = reporter.pending(glob.iglob(files, recursive=True))
+    if threads > 0:
+        validate_files = partial(_validate_rng_in_threads, threads=threads, rng=rng)
     else:
-        click.echo(click.style("All good!", fg="green"))
+        validate_files = partial(_validate_in_pool, rng=rng)
+    results = _with_cache(files, cache, validate_files, rng=rng)
+    _report(reporter, results, fail_fast)
 
 
 @click.command()
@@ -137,27 +655,72 @@ def validate_rng(files: str, rng: str) -> None:
     help="Path to the Schematron file.",
     type=str,
 )
-def validate_schematron(files: str, schematron: str) -> None:
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    default=False,
+    help="Stop at the first file that fails validation.",
+)
+@click.option(
+    "--cache",
+    default=".xml-validator-cache.sqlite",
+    help="Path to the result cache of unchanged files; pass an empty string to disable it.",
+    type=str,
+)
+@click.option(
+    "--format",
+    "output_format",
+    default="text",
+    help="Output format; json writes one JSON record per file.",
+    type=click.Choice(["text", "json"]),
+)
+@click.option(
+    "--out-file",
+    default=None,
+    help="File to write the json records to instead of stdout; requires --format json.",
+    type=str,
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Skip files already recorded in --out-file and append to it.",
+)
+def validate_schematron(
+    files: str,
+    schematron: str,
+    fail_fast: bool,
+    cache: str,
+    output_format: str,
+    out_file: str | None,
+    resume: bool,
+) -> None:
     """Validate XML files against Schematron schema only.
 
     This command validates XML files against a Schematron (.sch) schema for
     rule-based validation. RelaxNG validation is skipped.
 
     Args:
-        files: Glob pattern for XML files to validate (e.g., "data/*.xml")
+        files: Glob pattern for XML files to validate (e.g., "data/*.xml";
+            "**" matches nested directories)
         schematron: Path to the Schematron schema file (.sch)
+        fail_fast: Stop at the first file that fails validation
+        cache: Path to the SQLite result cache; files that did not change since
+            they were last validated against the same schemas are skipped
+        output_format: "text" or "json" (one JSON record per file)
+        out_file: File to write the json records to instead of stdout
+        resume: Skip files already recorded in out_file and append to it
 
     Exit codes:
         0: All files are valid according to Schematron schema
         1: One or more files failed Schematron validation
     """
-    files = sorted(glob.glob(files))
-    validator = Validator(path_to_schematron=schematron)
-    results = set()
-    for x in tqdm(files):
-        results.add(validator.validate_against_schematron(x))
-    if False in results:
-        click.echo(click.style("ERRORS!!!!", fg="red"))
-        sys.exit(1)
-    else:
-        click.echo(click.style("All good!", fg="green"))
+    reporter = _Reporter(output_format, out_file, resume)
+    files = reporter.pending(glob.iglob(files, recursive=True))
+    results = _with_cache(
+        files,
+        cache,
+        partial(_validate_in_pool, schematron=schematron),
+        schematron=schematron,
+    )
+    _report(reporter, results, fail_fast)